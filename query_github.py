@@ -22,6 +22,7 @@ Providing a token increases the rate-limit to 5,000 requests per hour and
 allows access to private repositories owned by the user or organization.
 """
 import argparse
+import hashlib
 import json
 import logging
 import sys
@@ -31,6 +32,7 @@ from typing import Dict, List, Callable, Tuple, Optional, Any
 import requests
 from dotenv import load_dotenv
 from pathlib import Path
+import shutil
 import time
 
 # Load environment variables from .env located next to this script (project root).
@@ -47,6 +49,11 @@ API_CALL_COUNT = 0
 REQUEST_TIMEOUT = (5, 30)  # (connect_timeout, read_timeout) in seconds
 MAX_RETRIES = 3
 
+# Shared session so paginated GraphQL calls reuse one keep-alive connection
+# (and TLS handshake) instead of opening a new one per request.
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept": "application/vnd.github+json"})
+
 # Paging sizes tunable via environment (smaller sizes help stay under strict proxy timeouts)
 GRAPHQL_PAGE_SIZE = int(os.getenv("GITHUB_GRAPHQL_PAGE_SIZE", "10"))  # default 50 nodes
 
@@ -65,17 +72,17 @@ def _github_graphql(query: str, variables: dict, headers: dict, *, timeout: tupl
     for attempt in range(1, max_retries + 1):
         global API_CALL_COUNT
         API_CALL_COUNT += 1
-        start = time.perf_counter()
+        start_ns = time.monotonic_ns()
         try:
-            resp = requests.post(
+            resp = _SESSION.post(
                 GRAPHQL_ENDPOINT,
                 json={"query": query, "variables": variables},
                 headers=headers,
                 timeout=timeout,
             )
             resp.raise_for_status()
-            duration = time.perf_counter() - start
-            logger.debug("GraphQL request completed in %.3fs", duration)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("GraphQL request completed in %.3fs", (time.monotonic_ns() - start_ns) / 1e9)
             payload = resp.json()
             if payload.get("errors"):
                 raise SystemExit(f"GitHub GraphQL errors: {payload['errors']}")
@@ -83,14 +90,14 @@ def _github_graphql(query: str, variables: dict, headers: dict, *, timeout: tupl
         except requests.HTTPError as exc:
             status = exc.response.status_code
             if status != 504 or attempt == max_retries:
-                duration = time.perf_counter() - start
+                duration = (time.monotonic_ns() - start_ns) / 1e9
                 logger.warning("GraphQL request failed after %.3fs: %s", duration, exc)
                 raise SystemExit(
                     f"GitHub GraphQL error {status}: {exc.response.text}"
                 ) from exc
         except (requests.Timeout, requests.ConnectionError) as exc:
             if attempt == max_retries:
-                duration = time.perf_counter() - start
+                duration = (time.monotonic_ns() - start_ns) / 1e9
                 logger.warning("GraphQL connection error after %.3fs: %s", duration, exc)
                 raise SystemExit(f"GitHub connection error: {exc}") from exc
         sleep_s = 2 ** attempt
@@ -100,9 +107,18 @@ def _github_graphql(query: str, variables: dict, headers: dict, *, timeout: tupl
         time.sleep(sleep_s)
 
 
+def _auth_headers(token: str) -> Dict[str, str]:
+    """Return the per-request headers; static ones live on *_SESSION*."""
+    return {"Authorization": f"bearer {token}"}
+
+
+# Characters that are path separators or reserved in Windows filenames.
+_SANITIZE_TABLE = str.maketrans({c: "__" for c in "/\\:*?\"<>|"})
+
+
 def _sanitize(name: str) -> str:
-    """Return filesystem-safe version of *name* (replace / with __)."""
-    return name.replace("/", "__")
+    """Return filesystem-safe version of *name* (replace / and other reserved characters with __)."""
+    return name.translate(_SANITIZE_TABLE)
 
 
 def _fetch_paginated_gql_data(
@@ -151,10 +167,7 @@ def list_repos_branches_graphql(username: str, token: str, is_org: bool = False)
     Retrieves repositories in batches and, for each repository, grabs
     branches, paginating when necessary.
     """
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"bearer {token}",
-    }
+    headers = _auth_headers(token)
     result: Dict[str, List[str]] = {}
     root_field = "organization" if is_org else "user"
 
@@ -168,7 +181,7 @@ def list_repos_branches_graphql(username: str, token: str, is_org: bool = False)
                   pageInfo {{ hasNextPage endCursor }}
                   nodes {{
                     name
-                    refs(refPrefix: \"refs/heads/\", first: {GRAPHQL_PAGE_SIZE}) {{
+                    refs(refPrefix: \"refs/heads/\", first: {GRAPHQL_PAGE_SIZE}, orderBy: {{field: ALPHABETICAL, direction: ASC}}) {{
                       pageInfo {{ hasNextPage endCursor }}
                       nodes {{ name }}
                     }}
@@ -206,7 +219,7 @@ def list_repos_branches_graphql(username: str, token: str, is_org: bool = False)
                     f"""
                     query($owner: String!, $name: String!, $after: String!) {{
                       repository(owner: $owner, name: $name) {{
-                        refs(refPrefix: \"refs/heads/\", first: {GRAPHQL_PAGE_SIZE}, after: $after) {{
+                        refs(refPrefix: \"refs/heads/\", first: {GRAPHQL_PAGE_SIZE}, after: $after, orderBy: {{field: ALPHABETICAL, direction: ASC}}) {{
                           pageInfo {{ hasNextPage endCursor }}
                           nodes {{ name }}
                         }}
@@ -228,7 +241,7 @@ def list_repos_branches_graphql(username: str, token: str, is_org: bool = False)
             )
             branches.extend([ref["name"] for ref in remaining_branch_nodes])
             
-        result[repo_name] = sorted(list(set(branches))) # Ensure unique and sorted branches
+        result[repo_name] = branches  # refs are unique per prefix and ordered server-side
 
     return result
 
@@ -241,24 +254,25 @@ def fetch_repos_full_graphql(username: str, token: str, include_tags: bool, is_o
     """Return (repo_map, branches_map, tags_map) with full details via GraphQL.
 
     *repo_map*   : repo_name → raw repository dictionary
-    *branches_map*: repo_name → list of branch dictionaries (each with commit data)
-    *tags_map*   : repo_name → list of tag dictionaries
+    *branches_map*: repo_name → {branch_name: branch dictionary (with commit data)}
+    *tags_map*   : repo_name → {tag_name: tag dictionary}
+
+    Inner mappings keep the order in which GitHub returned the refs.
     """
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"bearer {token}",
-    }
+    headers = _auth_headers(token)
 
     repo_map: dict[str, dict] = {}
-    branch_map: dict[str, list[dict]] = {}
-    tag_map: dict[str, list[dict]] = {}
+    branch_map: dict[str, dict[str, dict]] = {}
+    tag_map: dict[str, dict[str, dict]] = {}
 
     root_field = "organization" if is_org else "user"
 
     # --- Repository Pagination --- 
     def build_repo_query_and_vars(after_cursor: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+        # Tags are always in the query text but only resolved when the
+        # $includeTags variable is true.
         tags_fragment = """
-            tags: refs(refPrefix: \"refs/tags/\", first: $refsPageSize, orderBy: {field: TAG_COMMIT_DATE, direction: DESC}) {
+            tags: refs(refPrefix: \"refs/tags/\", first: $refsPageSize, orderBy: {field: TAG_COMMIT_DATE, direction: DESC}) @include(if: $includeTags) {
               pageInfo { hasNextPage endCursor }
               nodes {
                 name
@@ -289,11 +303,11 @@ def fetch_repos_full_graphql(username: str, token: str, include_tags: bool, is_o
                 }
               }
             }
-        """ if include_tags else ""
+        """
 
         query = textwrap.dedent(
             f"""
-            query($login: String!, $after: String, $refsPageSize: Int!) {{
+            query($login: String!, $after: String, $refsPageSize: Int!, $includeTags: Boolean!) {{
               {root_field}(login: $login) {{
                 repositories(first: {GRAPHQL_PAGE_SIZE}, after: $after, ownerAffiliations: OWNER) {{
                   pageInfo {{ hasNextPage endCursor }}
@@ -405,7 +419,7 @@ def fetch_repos_full_graphql(username: str, token: str, include_tags: bool, is_o
             }}
             """
         )
-        return query, {"login": username, "after": after_cursor, "refsPageSize": GRAPHQL_PAGE_SIZE}
+        return query, {"login": username, "after": after_cursor, "refsPageSize": GRAPHQL_PAGE_SIZE, "includeTags": include_tags}
 
     def extract_repo_nodes_and_pageinfo(data: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         root_obj = data.get(root_field) or {}
@@ -491,7 +505,7 @@ def fetch_repos_full_graphql(username: str, token: str, include_tags: bool, is_o
             )
             current_repo_branches.extend(remaining_branch_nodes)
         
-        branch_map[repo_name] = current_repo_branches
+        branch_map[repo_name] = {br["name"]: br for br in current_repo_branches}
 
         # --- Tag Pagination for current repo (if requested) --- 
         if include_tags:
@@ -563,18 +577,78 @@ def fetch_repos_full_graphql(username: str, token: str, include_tags: bool, is_o
                 )
                 current_repo_tags.extend(first_page_tag_nodes)
             
-            tag_map[repo_name] = current_repo_tags
+            tag_map[repo_name] = {tg["name"]: tg for tg in current_repo_tags}
 
-    # Post-process primaryLanguage in repo_map
-    for repo_details in repo_map.values():
+    # Post-process primaryLanguage in repo_map. Build a new dict rather than
+    # editing the node so the GraphQL response itself is left untouched.
+    for repo_name, repo_details in repo_map.items():
         lang_dict = repo_details.get('primaryLanguage')
         if isinstance(lang_dict, dict) and 'name' in lang_dict:
-            repo_details['primaryLanguage'] = lang_dict['name']
+            repo_map[repo_name] = {**repo_details, 'primaryLanguage': lang_dict['name']}
         # If lang_dict is None, it remains None. If it's already a string, it's also fine.
 
     return repo_map, branch_map, tag_map
 
 
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """Write *data* to *path* unless the file already holds identical bytes.
+
+    The size check short-circuits the common "no change" run without reading
+    the old file; contents are only compared when the sizes match. Returns
+    True when the file was (re)written.
+    """
+    try:
+        same_size = path.stat().st_size == len(data)
+    except FileNotFoundError:
+        same_size = False
+    if same_size and path.read_bytes() == data:
+        return False
+    # Replace rather than truncate: persist_branches hardlinks identical files
+    # together, and an in-place write would change every linked copy.
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_bytes(data)
+        if path.exists():
+            shutil.copymode(path, tmp)  # keep e.g. a user's chmod 600
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Make *dst* a hardlink to *src*, copying instead where links are unsupported."""
+    if dst.exists() and os.path.samefile(src, dst):
+        return
+    tmp = dst.with_name(dst.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _ensure_repo_dirs(base: Path, repos: List[str]) -> Dict[str, Path]:
+    """Return {repo: <base>/<repo>}, creating only the directories that are missing.
+
+    A single ``os.scandir`` of *base* replaces one ``mkdir`` call per repo on
+    reruns, where nearly every repo directory already exists.
+    """
+    base.mkdir(parents=True, exist_ok=True)
+    with os.scandir(base) as it:
+        existing = {entry.name for entry in it if entry.is_dir()}
+    repo_dirs: Dict[str, Path] = {}
+    for repo in repos:
+        repo_dir = base / repo
+        if repo not in existing:
+            repo_dir.mkdir(parents=True, exist_ok=True)
+        repo_dirs[repo] = repo_dir
+    return repo_dirs
+
+
 def persist_branches(repo_br_map: Dict[str, List[str]], out_dir: str) -> None:
     """Write each repo's branches to a file inside *out_dir*.
 
@@ -582,9 +656,13 @@ def persist_branches(repo_br_map: Dict[str, List[str]], out_dir: str) -> None:
     named `<repo>.txt` containing one branch per line, sorted
     alphabetically. If the file already exists, compare old vs new
     content and print a brief summary of additions/removals.
+
+    Repos with identical branch lists (e.g. just ``main``) share one file
+    on disk: the first is written normally and the rest are hardlinked to it.
     """
     p = Path(out_dir)
     p.mkdir(parents=True, exist_ok=True)
+    seen: Dict[bytes, Path] = {}
 
     for repo, branches in repo_br_map.items():
         file = p / f"{repo}.txt"
@@ -592,10 +670,17 @@ def persist_branches(repo_br_map: Dict[str, List[str]], out_dir: str) -> None:
         added: set[str] = set()
         removed: set[str] = set()
         if file.exists():
-            old_set = {line.strip() for line in file.read_text().splitlines() if line.strip()}
+            old_set = {line.strip() for line in file.read_text(encoding="utf-8").splitlines() if line.strip()}
             added = new_set - old_set
             removed = old_set - new_set
-        file.write_text("\n".join(sorted(new_set)) + "\n")
+        content = ("\n".join(sorted(new_set)) + "\n").encode("utf-8")
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+        first = seen.get(digest)
+        if first is None:
+            seen[digest] = file
+            _write_if_changed(file, content)
+        else:
+            _link_or_copy(first, file)
         if added or removed:
             logger.info("%s: +%d -%d branches updated", repo, len(added), len(removed))
             print(f"{repo}: +{len(added)} -{len(removed)} branches updated")
@@ -607,58 +692,49 @@ def persist_repo_json(repo_data: Dict[str, dict], out_dir: str) -> None:
     p.mkdir(parents=True, exist_ok=True)
     for name, payload in repo_data.items():
         file = p / f"{name}.json"
-        serialized = json.dumps(payload, indent=2, sort_keys=True)
-        new_content = serialized + "\n"
-        changed = True
-        if file.exists() and file.read_text() == new_content:
-            changed = False
-        file.write_text(new_content)
-        if changed:
-            logger.info("%s: JSON updated (size %d bytes)", name, len(new_content))
-            print(f"{name}: JSON updated (size {len(new_content)} bytes)")
-
-
-def persist_branch_json(branch_map: Dict[str, List[dict]], out_dir: str) -> None:
+        new_bytes = (json.dumps(payload, indent=2, sort_keys=True) + "\n").encode()
+        if _write_if_changed(file, new_bytes):
+            logger.info("%s: JSON updated (size %d bytes)", name, len(new_bytes))
+            print(f"{name}: JSON updated (size {len(new_bytes)} bytes)")
+
+
+def persist_branch_json(branch_map: Dict[str, Dict[str, dict]], out_dir: str) -> None:
     """Persist each branch JSON to `<out_dir>/<repo>/<branch>.json`."""
-    base = Path(out_dir)
+    repo_dirs = _ensure_repo_dirs(Path(out_dir), list(branch_map))
     for repo, branches in branch_map.items():
-        repo_dir = base / repo
-        repo_dir.mkdir(parents=True, exist_ok=True)
-        for br in branches:
-            fname = _sanitize(br.get("name", "unnamed")) + ".json"
+        repo_dir = repo_dirs[repo]
+        for name, br in branches.items():
+            fname = _sanitize(name) + ".json"
             file = repo_dir / fname
-            serialized = json.dumps(br, indent=2, sort_keys=True)
-            new_content = serialized + "\n"
-            changed = True
-            if file.exists() and file.read_text() == new_content:
-                changed = False
-            file.write_text(new_content)
-            if changed:
-                logger.info("%s/%s: branch JSON updated", repo, br.get("name"))
-                print(f"{repo}/{br.get('name')}: branch JSON updated")
-
-
-def persist_tag_json(tag_map: Dict[str, List[dict]], out_dir: str) -> None:
+            new_bytes = (json.dumps(br, indent=2, sort_keys=True) + "\n").encode()
+            if _write_if_changed(file, new_bytes):
+                logger.info("%s/%s: branch JSON updated", repo, name)
+                print(f"{repo}/{name}: branch JSON updated")
+
+
+def persist_tag_json(tag_map: Dict[str, Dict[str, dict]], out_dir: str) -> None:
     """Persist each tag JSON to `<out_dir>/<repo>/<tag>.json`."""
-    base = Path(out_dir)
+    repo_dirs = _ensure_repo_dirs(Path(out_dir), list(tag_map))
     for repo, tags in tag_map.items():
-        repo_dir = base / repo
-        repo_dir.mkdir(parents=True, exist_ok=True)
-        for tg in tags:
-            name = tg.get("name", "unnamed")
+        repo_dir = repo_dirs[repo]
+        for name, tg in tags.items():
             fname = _sanitize(name) + ".json"
             file = repo_dir / fname
-            serialized = json.dumps(tg, indent=2, sort_keys=True)
-            new_content = serialized + "\n"
-            changed = True
-            if file.exists() and file.read_text() == new_content:
-                changed = False
-            file.write_text(new_content)
-            if changed:
+            new_bytes = (json.dumps(tg, indent=2, sort_keys=True) + "\n").encode()
+            if _write_if_changed(file, new_bytes):
                 logger.info("%s/%s: tag JSON updated", repo, name)
                 print(f"{repo}/{name}: tag JSON updated")
 
 
+def _write_stdout(text: str) -> None:
+    """Write *text* to stdout in one call instead of one print() per line.
+
+    Going through the text stream keeps its encoding error handler and
+    newline translation.
+    """
+    sys.stdout.write(text)
+
+
 def cli() -> None:
     parser = argparse.ArgumentParser(description="List all GitHub repos and branches for a user or organization.")
     parser.add_argument("login", help="GitHub username or organization to query")
@@ -674,7 +750,7 @@ def cli() -> None:
     args = parser.parse_args()
 
     global logger
-    start_time = time.perf_counter()
+    start_ns = time.monotonic_ns()
     debug_log_dir = Path(args.log_dir)
     debug_log_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
@@ -707,8 +783,8 @@ def cli() -> None:
     include_tags_for_fetch = bool(args.save_tag_json_dir or (args.save_json_dir and need_full_details))
 
     repo_map: Dict[str, Dict] = {}
-    branch_map_full: Dict[str, List[Dict]] = {} # For detailed branch objects
-    tag_map_full: Dict[str, List[Dict]] = {}    # For detailed tag objects
+    branch_map_full: Dict[str, Dict[str, Dict]] = {} # For detailed branch objects, keyed by name
+    tag_map_full: Dict[str, Dict[str, Dict]] = {}    # For detailed tag objects, keyed by name
     repo_branch_list_map: Dict[str, List[str]] = {} # For {repo_name: [branch_names]}
 
     if need_full_details:
@@ -718,7 +794,7 @@ def cli() -> None:
         # Derive the simple branch list map from the full branch data
         if branch_map_full: # Ensure it's not empty
             repo_branch_list_map = {
-                name: sorted(list(set(br_node["name"] for br_node in branches if "name" in br_node)))
+                name: list(branches)
                 for name, branches in branch_map_full.items() if branches
             }
     else:
@@ -741,8 +817,8 @@ def cli() -> None:
                 full_map = {
                     name: {
                         "repo": repo_data,
-                        "branches": branch_map_full.get(name, []),
-                        "tags": tag_map_full.get(name, []) if include_tags_for_fetch else [],
+                        "branches": list(branch_map_full.get(name, {}).values()),
+                        "tags": list(tag_map_full.get(name, {}).values()) if include_tags_for_fetch else [],
                     }
                     for name, repo_data in repo_map.items()
                 }
@@ -772,13 +848,15 @@ def cli() -> None:
         json.dump(repo_branch_list_map, sys.stdout, indent=2)
         sys.stdout.write("\n")
     elif repo_branch_list_map: # Only print if not JSON and if there's data
+        lines: List[str] = []
         for repo, branches in repo_branch_list_map.items():
-            print(repo)
-            for br in branches:
-                print(f"  └─ {br}")
+            lines.append(repo)
+            lines.extend(f"  └─ {br}" for br in branches)
+        _write_stdout("\n".join(lines) + "\n")
 
     logger.info("Total GitHub API calls: %d", API_CALL_COUNT)
-    logger.info("Total runtime: %.2f seconds", time.perf_counter() - start_time)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Total runtime: %.2f seconds", (time.monotonic_ns() - start_ns) / 1e9)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+import copy
+
+import pytest
+
+import query_github
+
+from tests.graphql_helpers import GraphQLStub
+
+
+@pytest.fixture(autouse=True)
+def reset_api_count():
+    """Start every test with query_github.API_CALL_COUNT at zero."""
+    query_github.API_CALL_COUNT = 0
+    yield
+
+
+@pytest.fixture
+def gql_stub(monkeypatch):
+    """Return an installer that puts a GraphQLStub in place of _github_graphql.
+
+    ``gql_stub(responses, login, include_tags, tag)`` returns the stub, whose
+    *calls* log every request. The responses are often shared module
+    constants, so the fixture also checks on teardown that the fetch left
+    them unchanged.
+    """
+    snapshots = []
+
+    def _install(responses, login, include_tags, tag):
+        stub = GraphQLStub(responses, login, include_tags, tag)
+        snapshots.append((responses, copy.deepcopy(dict(responses))))
+        monkeypatch.setattr(query_github, '_github_graphql', stub)
+        return stub
+
+    yield _install
+    for responses, before in snapshots:
+        assert dict(responses) == before
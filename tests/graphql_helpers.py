@@ -0,0 +1,91 @@
+"""Shared GraphQL response builders, stub and assertions for the fetch tests."""
+from typing import NamedTuple, Optional
+
+
+def ref(name, oid, headline):
+    """Branch/tag node, as both the API and fetch_repos_full_graphql shape it."""
+    return {'name': name, 'target': {'oid': oid, 'messageHeadline': headline, 'message': 'Test commit message.'}}
+
+
+def connection(nodes=(), cursor=None):
+    """A refs/tags/repositories connection; a cursor means another page follows."""
+    return {'pageInfo': {'hasNextPage': cursor is not None, 'endCursor': cursor}, 'nodes': list(nodes)}
+
+
+def repo_node(name, description, refs, tags=None, **overrides):
+    """Repository node; fields a test doesn't set get fixed defaults.
+
+    *tags* is left out when None, as it is without include_tags.
+    """
+    node = {
+        'name': name, 'description': description, 'url': '',
+        'stargazerCount': 0, 'forkCount': 0, 'isFork': False, 'isPrivate': False, 'primaryLanguage': None,
+        'createdAt': '2023-01-01T00:00:00Z', 'updatedAt': '2023-01-01T00:00:00Z', 'pushedAt': '2023-01-01T00:00:00Z',
+        'refs': refs,
+    }
+    if tags is not None:
+        node['tags'] = tags
+    node.update(overrides)
+    return node
+
+
+def repos_page(owner_field, *nodes, cursor=None):
+    """One page of repositories under *owner_field* ('user' or 'organization')."""
+    return {owner_field: {'repositories': connection(nodes, cursor)}}
+
+
+class CallRecord(NamedTuple):
+    """The variables that identify one _github_graphql request."""
+    login: Optional[str]
+    repoName: Optional[str]
+    refPrefix: Optional[str]
+    after: Optional[str]
+
+
+class GraphQLStub:
+    """Stand-in for _github_graphql that looks responses up by request key.
+
+    *responses* is keyed on (login, repoName, refPrefix, after) tuples. The
+    CallRecord of every call is kept in *calls*; being a tuple, it compares
+    equal to those keys. Repository-list calls must carry *include_tags*,
+    and per-repo branch/tag pages must name *login* as their owner.
+    """
+    __slots__ = ('responses', 'login', 'include_tags', 'tag', 'calls')
+
+    def __init__(self, responses, login, include_tags, tag):
+        self.responses = responses
+        self.login = login
+        self.include_tags = include_tags
+        self.tag = tag
+        self.calls = []
+
+    def __call__(self, query, variables, headers):
+        key = CallRecord(variables.get("login"), variables.get("repoName"),
+                         variables.get("refPrefix"), variables.get("after"))
+        self.calls.append(key)
+        if key.login is not None:
+            assert variables["includeTags"] is self.include_tags, variables
+        else:
+            # Per-repo branch/tag pages must ask for the owner that was listed.
+            assert variables["owner"] == self.login, variables
+        try:
+            return self.responses[key]
+        except KeyError:
+            raise ValueError(f"Unexpected GQL call for {self.tag} test: {variables}") from None
+
+
+def by_name(refs_by_repo):
+    """Key each repo's expected branch/tag list by name, as fetch_repos_full_graphql does."""
+    return {repo: {ref['name']: ref for ref in refs} for repo, refs in refs_by_repo.items()}
+
+
+def assert_refs(fetched, expected):
+    """Check a fetched {repo: {name: ref}} map against expected {repo: [ref, ...]} lists.
+
+    Dict equality ignores order, so each repo's names are also compared in
+    the order the API returned them.
+    """
+    assert fetched == by_name(expected)
+    assert {repo: list(refs) for repo, refs in fetched.items()} == {
+        repo: [ref['name'] for ref in refs] for repo, refs in expected.items()
+    }
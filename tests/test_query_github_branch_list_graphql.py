@@ -0,0 +1,34 @@
+import query_github
+from tests.graphql_helpers import connection, repos_page
+
+# Test cases for list_repos_branches_graphql
+
+_REPO_PAGE = repos_page(
+    "user",
+    {"name": "repo_b", "refs": connection([{"name": "main"}, {"name": "dev"}], cursor="repo_b_cursor")},
+    {"name": "repo_a", "refs": connection([{"name": "trunk"}])},
+)
+
+_REPO_B_BRANCH_PAGE = {"repository": {"refs": connection([{"name": "feat/x"}, {"name": "alpha"}])}}
+
+
+def test_list_repos_branches_graphql_keeps_server_order(monkeypatch):
+    """Repos and branches come back in API order, including later branch pages, without re-sorting."""
+    responses = iter([_REPO_PAGE, _REPO_B_BRANCH_PAGE])
+    api_calls = []
+
+    def _stub(query, variables, headers):
+        api_calls.append(variables)
+        return next(responses)
+
+    monkeypatch.setattr(query_github, "_github_graphql", _stub)
+    result = query_github.list_repos_branches_graphql("list_user", "test_token")
+
+    assert [(v.get("login"), v.get("owner"), v.get("name"), v.get("after")) for v in api_calls] == [
+        ("list_user", None, None, None),
+        (None, "list_user", "repo_b", "repo_b_cursor"),
+    ]
+    assert list(result.items()) == [
+        ("repo_b", ["main", "dev", "feat/x", "alpha"]),
+        ("repo_a", ["trunk"]),
+    ]
@@ -0,0 +1,141 @@
+import io
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+import query_github
+
+# Test cases for the persistence and output helpers
+
+
+def test_persist_repo_json_skips_unchanged_file(tmp_path):
+    """An unchanged payload must not rewrite (or report) the existing file."""
+    query_github.persist_repo_json({"repo1": {"name": "repo1"}}, str(tmp_path))
+    out_file = tmp_path / "repo1.json"
+    first_mtime = out_file.stat().st_mtime_ns
+    os.utime(out_file, ns=(0, 0))
+
+    query_github.persist_repo_json({"repo1": {"name": "repo1"}}, str(tmp_path))
+    assert out_file.stat().st_mtime_ns == 0
+    assert first_mtime != 0
+
+
+def test_persist_repo_json_rewrites_same_size_change(tmp_path):
+    """A same-sized but different payload is still detected and rewritten."""
+    query_github.persist_repo_json({"repo1": {"name": "aaaa"}}, str(tmp_path))
+    query_github.persist_repo_json({"repo1": {"name": "bbbb"}}, str(tmp_path))
+    assert '"bbbb"' in (tmp_path / "repo1.json").read_text()
+
+
+def test_persist_repo_json_keeps_file_mode_on_rewrite(tmp_path):
+    """Replacing a changed file must not reset permissions the user set on it."""
+    query_github.persist_repo_json({"repo1": {"name": "aaaa"}}, str(tmp_path))
+    out_file = tmp_path / "repo1.json"
+    out_file.chmod(0o600)
+    query_github.persist_repo_json({"repo1": {"name": "changed"}}, str(tmp_path))
+    assert out_file.stat().st_mode & 0o777 == 0o600
+
+
+def test_persist_repo_json_removes_tmp_file_on_failed_write(tmp_path, monkeypatch):
+    def _fail(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(query_github.os, "replace", _fail)
+    with pytest.raises(OSError):
+        query_github.persist_repo_json({"repo1": {"name": "repo1"}}, str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_persist_branch_json_writes_per_repo_files(tmp_path):
+    query_github.persist_branch_json(
+        {"repo1": {"main": {"name": "main"}, "feat/x": {"name": "feat/x"}}}, str(tmp_path)
+    )
+    assert (tmp_path / "repo1" / "main.json").exists()
+    assert (tmp_path / "repo1" / "feat__x.json").exists()
+
+
+def test_persist_tag_json_reuses_existing_repo_dir(tmp_path):
+    """Repo directories left by a previous run are written into, not recreated."""
+    (tmp_path / "repo1").mkdir()
+    (tmp_path / "repo1" / "old.json").write_text("{}\n")
+    query_github.persist_tag_json({"repo1": {"v1.0": {"name": "v1.0"}}, "repo2": {"v2.0": {"name": "v2.0"}}}, str(tmp_path))
+    assert (tmp_path / "repo1" / "old.json").exists()
+    assert (tmp_path / "repo1" / "v1.0.json").exists()
+    assert (tmp_path / "repo2" / "v2.0.json").exists()
+
+
+def test_sanitize_replaces_reserved_characters():
+    assert query_github._sanitize("a/b/c") == "a__b__c"
+    assert query_github._sanitize('fix:win\\path*?"<>|') == "fix__win__path____________"
+    assert query_github._sanitize("main") == "main"
+
+
+def test_persist_branches_hardlinks_identical_lists(tmp_path):
+    """Repos with the same branch list share one inode; later edits stay per-repo."""
+    query_github.persist_branches({"a": ["main"], "b": ["main"], "c": ["dev", "main"]}, str(tmp_path))
+    assert (tmp_path / "a.txt").read_text() == "main\n"
+    assert os.path.samefile(tmp_path / "a.txt", tmp_path / "b.txt")
+    assert not os.path.samefile(tmp_path / "a.txt", tmp_path / "c.txt")
+
+    query_github.persist_branches({"a": ["main"], "b": ["main", "feat"]}, str(tmp_path))
+    assert (tmp_path / "a.txt").read_text() == "main\n"
+    assert (tmp_path / "b.txt").read_text() == "feat\nmain\n"
+
+
+def test_persist_branches_rereads_non_ascii_names_as_utf8(tmp_path, monkeypatch, capsys):
+    """A second run diffs against the UTF-8 file even under a non-UTF-8 locale."""
+    read_text = Path.read_text
+
+    def cp1252_default(self, encoding=None, errors=None):
+        # Stand in for a cp1252 locale: reads that don't name an encoding use it.
+        return read_text(self, encoding or "cp1252", errors)
+
+    monkeypatch.setattr(Path, "read_text", cp1252_default)
+    query_github.persist_branches({"repo1": ["Ábc", "main"]}, str(tmp_path))
+    capsys.readouterr()
+
+    query_github.persist_branches({"repo1": ["Ábc", "dev"]}, str(tmp_path))
+    assert capsys.readouterr().out == "repo1: +1 -1 branches updated\n"
+    assert (tmp_path / "repo1.txt").read_text(encoding="utf-8") == "dev\nÁbc\n"
+
+
+class _CountingBuffer(io.BytesIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+
+def test_write_stdout_emits_text_once(monkeypatch):
+    buffer = _CountingBuffer()
+    stdout = io.TextIOWrapper(buffer, encoding="utf-8", newline="\r\n")
+    monkeypatch.setattr(sys, "stdout", stdout)
+    stdout.write("before\n")
+    stdout.flush()
+    writes_before = buffer.writes
+    query_github._write_stdout("repo1\n  └─ main\n")
+    stdout.flush()
+    assert buffer.writes == writes_before + 1
+    assert buffer.getvalue() == "before\r\nrepo1\r\n  └─ main\r\n".encode("utf-8")
+
+
+def test_write_stdout_without_buffer(monkeypatch):
+    stdout = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", stdout)
+    query_github._write_stdout("repo1\n  └─ main\n")
+    assert stdout.getvalue() == "repo1\n  └─ main\n"
+
+
+def test_write_stdout_keeps_stream_error_handler(monkeypatch):
+    """PYTHONIOENCODING=ascii:replace must degrade to '?' rather than raise."""
+    buffer = io.BytesIO()
+    stdout = io.TextIOWrapper(buffer, encoding="ascii", errors="replace", newline="\n")
+    monkeypatch.setattr(sys, "stdout", stdout)
+    query_github._write_stdout("  └─ main\n")
+    stdout.flush()
+    assert buffer.getvalue() == b"  ?? main\n"
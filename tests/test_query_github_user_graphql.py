@@ -1,334 +1,252 @@
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
 
+import pytest
 import query_github
-from unittest.mock import patch
-
-# Test cases for fetch_repos_full_graphql (User)
-
-@patch('query_github._github_graphql')
-def test_fetch_repos_full_graphql_user_simple(mock_target_function):
-    """Test fetch_repos_full_graphql for a user with 1 repo, branches, tags, no pagination."""
-    user_repo_fetch_simple = {"user": {"repositories": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "repo1_user", "description": "Test Repo 1 User", "url": "", "stargazerCount": 1, "forkCount": 1, "isFork": False, "isPrivate": False, "primaryLanguage": None, "createdAt": "2023-01-01T00:00:00Z", "updatedAt": "2023-01-01T00:00:00Z", "pushedAt": "2023-01-01T00:00:00Z", "refs": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "main_user", "target": {"oid": "main_oid_user_simple", "messageHeadline": "Initial commit", "message": "Test commit message."}}]}, "tags": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "v1.0_user", "target": {"oid": "tag_oid_user_simple", "messageHeadline": "Release v1.0", "message": "Test commit message."}}]}}]}}}
-    api_calls_user_simple = []
-    call_count_user_simple = 0
-
-    def mock_gql_dispatch_user_simple(query, variables, headers):
-        nonlocal call_count_user_simple
-        api_calls_user_simple.append(variables.copy()); call_count_user_simple += 1; query_github.API_CALL_COUNT += 1
-        login_var = variables.get("login"); repo_name_var = variables.get("repoName"); ref_prefix_var = variables.get("refPrefix"); after_cursor_var = variables.get("after")
-        
-        if login_var == "test_user_simple" and not repo_name_var and not after_cursor_var: 
-            return user_repo_fetch_simple
-        # No other calls are expected
-        raise ValueError(f"Unexpected GQL call for user_simple test: {variables}")
-    
-    mock_target_function.side_effect = mock_gql_dispatch_user_simple 
-    query_github.API_CALL_COUNT = 0
-    repo_map, branch_map_full, tag_map_full = query_github.fetch_repos_full_graphql(
-        username="test_user_simple", token="token_simple_user", include_tags=True, is_org=False
-    )
-    assert query_github.API_CALL_COUNT == 1 # Only the main repo fetch
-    assert call_count_user_simple == 1
-    assert len(api_calls_user_simple) == 1
-    assert api_calls_user_simple[0].get("login") == "test_user_simple"
-    
-    assert len(repo_map) == 1
-    assert "repo1_user" in repo_map and repo_map["repo1_user"]["description"] == "Test Repo 1 User"
-    assert "repo1_user" in branch_map_full and branch_map_full["repo1_user"][0]["name"] == "main_user"
-    assert branch_map_full["repo1_user"][0]["target"]["oid"] == "main_oid_user_simple"
-    assert branch_map_full["repo1_user"][0]["target"]["messageHeadline"] == "Initial commit"
-    assert branch_map_full["repo1_user"][0]["target"]["message"] == "Test commit message."
-    assert "repo1_user" in tag_map_full and tag_map_full["repo1_user"][0]["name"] == "v1.0_user"
-    assert tag_map_full["repo1_user"][0]["target"]["oid"] == "tag_oid_user_simple"
-    assert tag_map_full["repo1_user"][0]["target"]["messageHeadline"] == "Release v1.0"
-    assert tag_map_full["repo1_user"][0]["target"]["message"] == "Test commit message."
-
-@patch('query_github._github_graphql')
-def test_fetch_repos_full_graphql_user_no_tags(mock_target_function):
-    repo_fetch_response_user_no_tags = {
-        "user": {
-            "repositories": {
-                "pageInfo": {"hasNextPage": False, "endCursor": None},
-                "nodes": [
-                    {
-                        "name": "repo_no_tag_test_user", "description": "Test repo, no tags fetched for user",
-                        "primaryLanguage": None, "createdAt": "2023-01-01T00:00:00Z", "updatedAt": "2023-01-01T00:00:00Z", 
-                        "pushedAt": "2023-01-01T00:00:00Z", "stargazerCount": 0, "forkCount": 0, "isFork": False, "isPrivate": False, "url": "",
-                        "refs": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "main_no_tags_user", "target": {"oid": "main_oid_no_tags_user", "messageHeadline": "Initial commit", "message": "Test commit message."}}]},
-                        # No 'tags' key here as include_tags will be False, query won't ask for it
-                    }
-                ]
-            }
-        }
-    }
-    api_calls_user_no_tags = []
-    call_count_user_no_tags = 0
-    
-    def mock_gql_dispatch_user_no_tags(query, variables, headers):
-        nonlocal call_count_user_no_tags
-        api_calls_user_no_tags.append(variables.copy()); call_count_user_no_tags += 1; query_github.API_CALL_COUNT += 1
-        login_var = variables.get("login"); repo_name_var = variables.get("repoName"); 
-        ref_prefix_var = variables.get("refPrefix"); after_cursor_var = variables.get("after")
-
-        if login_var == "user_no_tags_test" and not repo_name_var and not after_cursor_var:
-             return repo_fetch_response_user_no_tags
-        # No other calls expected
-        raise ValueError(f"Unexpected GQL call for user_no_tags test: {variables}")
-    
-    mock_target_function.side_effect = mock_gql_dispatch_user_no_tags
-    
-    query_github.API_CALL_COUNT = 0
+
+from tests.graphql_helpers import assert_refs, connection, ref, repo_node, repos_page
+
+TEST_TOKEN = "test_token"
+
+
+@dataclass
+class UserCase:
+    """One fetch_repos_full_graphql scenario for a user account.
+
+    *responses* maps each request's (login, repoName, refPrefix, after)
+    key to the GraphQL response it gets, in the order they are requested.
+    It is frozen on construction so no test can edit a shared table.
+    """
+    name: str
+    login: str
+    include_tags: bool
+    responses: Mapping[Tuple[Any, ...], Dict[str, Any]]
+    expected_repos: Dict[str, Dict[str, Any]]
+    expected_branches: Dict[str, List[Dict[str, Any]]]
+    expected_tags: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.responses = MappingProxyType(self.responses)
+
+
+# User GraphQL responses
+
+_USER_REPO_FETCH_SIMPLE = repos_page("user", repo_node(
+    "repo1_user", "Test Repo 1 User",
+    refs=connection([ref("main_user", "main_oid_user_simple", "Initial commit")]),
+    tags=connection([ref("v1.0_user", "tag_oid_user_simple", "Release v1.0")]),
+    stargazerCount=1, forkCount=1,
+))
+
+# No 'tags' key here as include_tags will be False, query won't ask for it
+_USER_REPO_FETCH_NO_TAGS = repos_page("user", repo_node(
+    "repo_no_tag_test_user", "Test repo, no tags fetched for user",
+    refs=connection([ref("main_no_tags_user", "main_oid_no_tags_user", "Initial commit")]),
+))
+
+_USER_REPO_FETCH_PAGE1 = repos_page("user", repo_node(
+    "user_repo_p1", "User Paginated Repo 1",
+    refs=connection([ref("main_p1", "main_oid_pag_repo1", "Commit for pag-repo1")]),
+    tags=connection(cursor="user_tag_cursor_p1"),
+    stargazerCount=1, forkCount=1,
+), cursor="user_repo_cursor_p2")
+
+_USER_REPO_FETCH_PAGE2 = repos_page("user", repo_node(
+    "user_repo_p2", "User Paginated Repo 2",
+    refs=connection([ref("main_p2", "main_oid_pag_repo2", "Commit for pag-repo2")]),
+    tags=connection(),
+    stargazerCount=2, forkCount=2,
+))
+
+# For user_repo_p1, called with after="user_tag_cursor_p1"
+_TAG_FETCH_REPO_P1 = {"repository": {"tags": connection([ref("v_p1", "tag_oid_pag_repo1", "Tag for pag-repo1")])}}
+# For user_repo_p2, called with after=None (fresh fetch)
+_TAG_FETCH_REPO_P2 = {"repository": {"tags": connection([ref("v_p2", "tag_oid_pag_repo2", "Tag for pag-repo2")])}}
+
+# Inline tags hasNextPage=False, paginated branches hasNextPage=True, endCursor="user_branch_cursor_inline_end"
+_USER_REPO_FETCH_SINGLE_MANY_B = repos_page("user", repo_node(
+    "repo_with_many_branches_user", "User Repo with paginated branches",
+    refs=connection([ref("main_for_user_branches", "main_oid_user_branches", "Initial commit")], cursor="user_branch_cursor_inline_end"),
+    tags=connection([ref("user_tag_for_branches_repo", "tag_oid_user_branches", "Tag for branches repo")]),
+))
+
+# Fetched with after="user_branch_cursor_inline_end"
+_USER_BRANCH_FETCH_PAGE1 = {"repository": {"refs": connection([ref("user_branch_X", "b1_oid_user_pb", "Branch 1 commit")], cursor="user_branch_cursor_page1_end")}}
+# Fetched with after="user_branch_cursor_page1_end"
+_USER_BRANCH_FETCH_PAGE2 = {"repository": {"refs": connection([ref("user_branch_Y", "b2_oid_user_pb", "Branch 2 commit")])}}
+
+# Inline branches hasNextPage=False, inline tags hasNextPage=True, endCursor="user_tag_cursor_inline_end"
+_USER_REPO_FETCH_SINGLE_MANY_T = repos_page("user", repo_node(
+    "repo_with_many_tags_user", "User Repo with paginated tags",
+    refs=connection([ref("main_for_user_tags", "main_oid_user_tags", "Initial commit")]),
+    tags=connection([ref("user_tag_initial", "tag_oid_user_tags", "Tag for tags repo")], cursor="user_tag_cursor_inline_end"),
+))
+
+# Fetched with after="user_tag_cursor_inline_end"
+_USER_TAG_FETCH_PAGE1 = {"repository": {"tags": connection([ref("user_tag_X", "t1_oid_user_tags", "Tag X commit")], cursor="user_tag_cursor_page1_end")}}
+# Fetched with after="user_tag_cursor_page1_end"
+_USER_TAG_FETCH_PAGE2 = {"repository": {"tags": connection([ref("user_tag_Y", "t2_oid_user_tags", "Tag Y commit")])}}
+
+# Paginated branches (inline + 2 pages), paginated tags (inline + 2 pages)
+_USER_REPO_FETCH_SINGLE_PAG_B_T = repos_page("user", repo_node(
+    "repo_user_pag_b_t", "User Repo paginated B & T",
+    refs=connection([ref("user_b_t_branch_main", "main_oid_user_b_t", "Initial commit")], cursor="user_b_t_branch_cursor_inline_end"),
+    tags=connection([ref("user_b_t_tag_v1", "tag_oid_user_b_t", "Tag v1 commit")], cursor="user_b_t_tag_cursor_inline_end"),
+))
+
+# after="user_b_t_branch_cursor_inline_end"
+_USER_B_T_BRANCH_FETCH_P1 = {"repository": {"refs": connection([ref("user_b_t_branch_dev", "b1_oid_user_b_t", "Branch dev commit")], cursor="user_b_t_branch_cursor_page1_end")}}
+# after="user_b_t_branch_cursor_page1_end"
+_USER_B_T_BRANCH_FETCH_P2 = {"repository": {"refs": connection([ref("user_b_t_branch_feat", "b2_oid_user_b_t", "Branch feat commit")])}}
+# after="user_b_t_tag_cursor_inline_end"
+_USER_B_T_TAG_FETCH_P1 = {"repository": {"tags": connection([ref("user_b_t_tag_v2", "t1_oid_user_b_t", "Tag v2 commit")], cursor="user_b_t_tag_cursor_page1_end")}}
+# after="user_b_t_tag_cursor_page1_end"
+_USER_B_T_TAG_FETCH_P2 = {"repository": {"tags": connection([ref("user_b_t_tag_v3", "t2_oid_user_b_t", "Tag v3 commit")])}}
+
+
+# User Test Cases
+
+SIMPLE = UserCase(
+    name="simple",
+    login="test_user_simple",
+    include_tags=True,
+    responses={
+        ("test_user_simple", None, None, None): _USER_REPO_FETCH_SIMPLE,
+    },
+    expected_repos={"repo1_user": {"description": "Test Repo 1 User"}},
+    expected_branches={"repo1_user": [ref("main_user", "main_oid_user_simple", "Initial commit")]},
+    expected_tags={"repo1_user": [ref("v1.0_user", "tag_oid_user_simple", "Release v1.0")]},
+)
+
+NO_TAGS = UserCase(
+    name="no_tags",
+    login="user_no_tags_test",
+    include_tags=False,
+    responses={
+        ("user_no_tags_test", None, None, None): _USER_REPO_FETCH_NO_TAGS,
+    },
+    expected_repos={"repo_no_tag_test_user": {}},
+    expected_branches={"repo_no_tag_test_user": [ref("main_no_tags_user", "main_oid_no_tags_user", "Initial commit")]},
+)
+
+# No separate branch calls needed for user_repo_p1 or user_repo_p2 as inline refs.hasNextPage=False
+PAGINATED_REPOS = UserCase(
+    name="paginated_repos",
+    login="user_paginated_repos",
+    include_tags=True,
+    responses={
+        ("user_paginated_repos", None, None, None): _USER_REPO_FETCH_PAGE1,
+        ("user_paginated_repos", None, None, "user_repo_cursor_p2"): _USER_REPO_FETCH_PAGE2,
+        (None, "user_repo_p1", None, "user_tag_cursor_p1"): _TAG_FETCH_REPO_P1,
+        (None, "user_repo_p2", None, None): _TAG_FETCH_REPO_P2, # Fresh tag fetch due to empty inline nodes and hasNextPage=False
+    },
+    expected_repos={
+        "user_repo_p1": {"description": "User Paginated Repo 1"},
+        "user_repo_p2": {"description": "User Paginated Repo 2"},
+    },
+    expected_branches={
+        "user_repo_p1": [ref("main_p1", "main_oid_pag_repo1", "Commit for pag-repo1")],
+        "user_repo_p2": [ref("main_p2", "main_oid_pag_repo2", "Commit for pag-repo2")],
+    },
+    expected_tags={
+        "user_repo_p1": [ref("v_p1", "tag_oid_pag_repo1", "Tag for pag-repo1")],
+        "user_repo_p2": [ref("v_p2", "tag_oid_pag_repo2", "Tag for pag-repo2")],
+    },
+)
+
+# No separate tag call needed for repo_with_many_branches_user as inline tags.hasNextPage=False
+PAGINATED_BRANCHES = UserCase(
+    name="paginated_branches",
+    login="user_many_branches_test",
+    include_tags=True,
+    responses={
+        ("user_many_branches_test", None, None, None): _USER_REPO_FETCH_SINGLE_MANY_B,
+        (None, "repo_with_many_branches_user", "refs/heads/", "user_branch_cursor_inline_end"): _USER_BRANCH_FETCH_PAGE1,
+        (None, "repo_with_many_branches_user", "refs/heads/", "user_branch_cursor_page1_end"): _USER_BRANCH_FETCH_PAGE2,
+    },
+    expected_repos={"repo_with_many_branches_user": {}},
+    expected_branches={
+        "repo_with_many_branches_user": [
+            ref("main_for_user_branches", "main_oid_user_branches", "Initial commit"),
+            ref("user_branch_X", "b1_oid_user_pb", "Branch 1 commit"),
+            ref("user_branch_Y", "b2_oid_user_pb", "Branch 2 commit"),
+        ],
+    },
+    expected_tags={
+        "repo_with_many_branches_user": [ref("user_tag_for_branches_repo", "tag_oid_user_branches", "Tag for branches repo")],
+    },
+)
+
+# No separate branch call needed for repo_with_many_tags_user
+PAGINATED_TAGS = UserCase(
+    name="paginated_tags",
+    login="user_many_tags_test",
+    include_tags=True,
+    responses={
+        ("user_many_tags_test", None, None, None): _USER_REPO_FETCH_SINGLE_MANY_T,
+        (None, "repo_with_many_tags_user", None, "user_tag_cursor_inline_end"): _USER_TAG_FETCH_PAGE1,
+        (None, "repo_with_many_tags_user", None, "user_tag_cursor_page1_end"): _USER_TAG_FETCH_PAGE2,
+    },
+    expected_repos={"repo_with_many_tags_user": {}},
+    expected_branches={
+        "repo_with_many_tags_user": [ref("main_for_user_tags", "main_oid_user_tags", "Initial commit")],
+    },
+    expected_tags={
+        "repo_with_many_tags_user": [
+            ref("user_tag_initial", "tag_oid_user_tags", "Tag for tags repo"),
+            ref("user_tag_X", "t1_oid_user_tags", "Tag X commit"),
+            ref("user_tag_Y", "t2_oid_user_tags", "Tag Y commit"),
+        ],
+    },
+)
+
+PAGINATED_BRANCHES_AND_TAGS = UserCase(
+    name="paginated_branches_and_tags",
+    login="user_pag_b_t_test",
+    include_tags=True,
+    responses={
+        ("user_pag_b_t_test", None, None, None): _USER_REPO_FETCH_SINGLE_PAG_B_T,
+        (None, "repo_user_pag_b_t", "refs/heads/", "user_b_t_branch_cursor_inline_end"): _USER_B_T_BRANCH_FETCH_P1,
+        (None, "repo_user_pag_b_t", "refs/heads/", "user_b_t_branch_cursor_page1_end"): _USER_B_T_BRANCH_FETCH_P2,
+        (None, "repo_user_pag_b_t", None, "user_b_t_tag_cursor_inline_end"): _USER_B_T_TAG_FETCH_P1,
+        (None, "repo_user_pag_b_t", None, "user_b_t_tag_cursor_page1_end"): _USER_B_T_TAG_FETCH_P2,
+    },
+    expected_repos={"repo_user_pag_b_t": {}},
+    expected_branches={
+        "repo_user_pag_b_t": [
+            ref("user_b_t_branch_main", "main_oid_user_b_t", "Initial commit"),
+            ref("user_b_t_branch_dev", "b1_oid_user_b_t", "Branch dev commit"),
+            ref("user_b_t_branch_feat", "b2_oid_user_b_t", "Branch feat commit"),
+        ],
+    },
+    expected_tags={
+        "repo_user_pag_b_t": [
+            ref("user_b_t_tag_v1", "tag_oid_user_b_t", "Tag v1 commit"),
+            ref("user_b_t_tag_v2", "t1_oid_user_b_t", "Tag v2 commit"),
+            ref("user_b_t_tag_v3", "t2_oid_user_b_t", "Tag v3 commit"),
+        ],
+    },
+)
+
+
+SCENARIOS = [SIMPLE, NO_TAGS, PAGINATED_REPOS, PAGINATED_BRANCHES, PAGINATED_TAGS, PAGINATED_BRANCHES_AND_TAGS]
+
+
+@pytest.mark.parametrize("case", SCENARIOS, ids=[c.name for c in SCENARIOS])
+def test_fetch_repos_full_graphql_user(gql_stub, case):
+    """Fetch a user's repositories, branches and tags, following every page in *case*."""
+    stub = gql_stub(case.responses, case.login, case.include_tags, f"user_{case.name}")
     repo_map, branch_map_full, tag_map_full = query_github.fetch_repos_full_graphql(
-        username="user_no_tags_test", token="token_no_tags_user", include_tags=False, is_org=False
+        username=case.login, token=TEST_TOKEN, include_tags=case.include_tags, is_org=False
     )
-    assert query_github.API_CALL_COUNT == 1 # Only the main repo fetch
-    assert call_count_user_no_tags == 1
-    assert len(api_calls_user_no_tags) == 1
-    assert api_calls_user_no_tags[0].get("login") == "user_no_tags_test"
-    assert len(repo_map) == 1
-    assert "repo_no_tag_test_user" in repo_map
-    assert "repo_no_tag_test_user" in branch_map_full and branch_map_full["repo_no_tag_test_user"][0]["name"] == "main_no_tags_user"
-    assert branch_map_full["repo_no_tag_test_user"][0]["target"]["oid"] == "main_oid_no_tags_user"
-    assert branch_map_full["repo_no_tag_test_user"][0]["target"]["messageHeadline"] == "Initial commit"
-    assert branch_map_full["repo_no_tag_test_user"][0]["target"]["message"] == "Test commit message."
-    assert not tag_map_full # tag_map_full should be empty
-
-@patch('query_github._github_graphql')
-def test_fetch_repos_full_graphql_user_paginated_repos(mock_target_function):
-    user_repo_fetch_page1 = {"user": {"repositories": {"pageInfo": {"hasNextPage": True, "endCursor": "user_repo_cursor_p2"}, "nodes": [{"name": "user_repo_p1", "description": "User Paginated Repo 1", "url": "", "stargazerCount": 1, "forkCount": 1, "isFork": False, "isPrivate": False, "primaryLanguage": None, "createdAt": "2023-01-01T00:00:00Z", "updatedAt": "2023-01-01T00:00:00Z", "pushedAt": "2023-01-01T00:00:00Z", "refs": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "main_p1", "target": {"oid": "main_oid_pag_repo1", "messageHeadline": "Commit for pag-repo1", "message": "Test commit message."}}]}, "tags": {"pageInfo": {"hasNextPage": True, "endCursor": "user_tag_cursor_p1"}, "nodes": []}}]}}}
-    user_repo_fetch_page2 = {"user": {"repositories": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "user_repo_p2", "description": "User Paginated Repo 2", "url": "", "stargazerCount": 2, "forkCount": 2, "isFork": False, "isPrivate": False, "primaryLanguage": None, "createdAt": "2023-01-01T00:00:00Z", "updatedAt": "2023-01-01T00:00:00Z", "pushedAt": "2023-01-01T00:00:00Z", "refs": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "main_p2", "target": {"oid": "main_oid_pag_repo2", "messageHeadline": "Commit for pag-repo2", "message": "Test commit message."}}]}, "tags": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": []}}]}}}
-    # No separate branch calls needed for user_repo_p1 or user_repo_p2 as inline refs.hasNextPage=False
-    tag_fetch_repo_p1 = {"repository": {"tags": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "v_p1", "target": {"oid": "tag_oid_pag_repo1", "messageHeadline": "Tag for pag-repo1", "message": "Test commit message."}}]}}} # For user_repo_p1, called with after="user_tag_cursor_p1"
-    tag_fetch_repo_p2 = {"repository": {"tags": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "v_p2", "target": {"oid": "tag_oid_pag_repo2", "messageHeadline": "Tag for pag-repo2", "message": "Test commit message."}}]}}} # For user_repo_p2, called with after=None (fresh fetch)
-    api_calls_user_pag_repos = []
-    call_count_user_pag_repos = 0
-    
-    def mock_gql_dispatch_user_pag_repos(query, variables, headers):
-        nonlocal call_count_user_pag_repos
-        api_calls_user_pag_repos.append(variables.copy()); call_count_user_pag_repos += 1; query_github.API_CALL_COUNT += 1
-        login_var = variables.get("login"); repo_name_var = variables.get("repoName"); ref_prefix_var = variables.get("refPrefix"); after_cursor_var = variables.get("after")
-        if login_var == "user_paginated_repos" and not repo_name_var: # Repo list calls
-            if not after_cursor_var: return user_repo_fetch_page1
-            elif after_cursor_var == "user_repo_cursor_p2": return user_repo_fetch_page2
-        elif repo_name_var == "user_repo_p1":
-            # No branch call expected for user_repo_p1 as inline refs.hasNextPage=False
-            if ref_prefix_var is None and after_cursor_var == "user_tag_cursor_p1": return tag_fetch_repo_p1
-        elif repo_name_var == "user_repo_p2":
-            # No branch call expected for user_repo_p2 as inline refs.hasNextPage=False
-            if ref_prefix_var is None and not after_cursor_var: return tag_fetch_repo_p2 # Fresh tag fetch due to empty inline nodes and hasNextPage=False
-        raise ValueError(f"Unexpected GQL call for user_paginated_repos test: {variables}")
-    
-    mock_target_function.side_effect = mock_gql_dispatch_user_pag_repos
-    query_github.API_CALL_COUNT = 0
-    repo_map, branch_map_full, tag_map_full = query_github.fetch_repos_full_graphql(username="user_paginated_repos", token="token_pag_repos", include_tags=True, is_org=False)
-    # Expected calls: repo_p1, repo_p2, tag_p1(paginated), tag_p2(fresh_fetch) = 4 calls
-    assert query_github.API_CALL_COUNT == 4; assert call_count_user_pag_repos == 4
-    assert len(api_calls_user_pag_repos) == 4
-    # Call 0: repo page 1
-    assert api_calls_user_pag_repos[0].get("login") == "user_paginated_repos" and api_calls_user_pag_repos[0].get("after") is None
-    # Call 1: repo page 2
-    assert api_calls_user_pag_repos[1].get("login") == "user_paginated_repos" and api_calls_user_pag_repos[1].get("after") == "user_repo_cursor_p2"
-    # Call 2: tag_p1 (paginated for user_repo_p1 from first repo page)
-    assert api_calls_user_pag_repos[2].get("repoName") == "user_repo_p1"
-    assert api_calls_user_pag_repos[2].get("refPrefix") is None 
-    assert api_calls_user_pag_repos[2].get("after") == "user_tag_cursor_p1"
-    # Call 3: tag_p2 (fresh fetch for user_repo_p2 from second repo page)
-    assert api_calls_user_pag_repos[3].get("repoName") == "user_repo_p2"
-    assert api_calls_user_pag_repos[3].get("refPrefix") is None
-    assert api_calls_user_pag_repos[3].get("after") is None
-
-    assert len(repo_map) == 2
-    assert "user_repo_p1" in repo_map and repo_map["user_repo_p1"]["description"] == "User Paginated Repo 1"
-    assert "user_repo_p2" in repo_map and repo_map["user_repo_p2"]["description"] == "User Paginated Repo 2"
-    assert "user_repo_p1" in branch_map_full and branch_map_full["user_repo_p1"][0]["name"] == "main_p1"
-    assert branch_map_full["user_repo_p1"][0]["target"]["oid"] == "main_oid_pag_repo1"
-    assert branch_map_full["user_repo_p1"][0]["target"]["messageHeadline"] == "Commit for pag-repo1"
-    assert branch_map_full["user_repo_p1"][0]["target"]["message"] == "Test commit message."
-    assert "user_repo_p1" in tag_map_full and tag_map_full["user_repo_p1"][0]["name"] == "v_p1"
-    assert tag_map_full["user_repo_p1"][0]["target"]["oid"] == "tag_oid_pag_repo1"
-    assert tag_map_full["user_repo_p1"][0]["target"]["messageHeadline"] == "Tag for pag-repo1"
-    assert tag_map_full["user_repo_p1"][0]["target"]["message"] == "Test commit message."
-    assert "user_repo_p2" in branch_map_full and branch_map_full["user_repo_p2"][0]["name"] == "main_p2"
-    assert branch_map_full["user_repo_p2"][0]["target"]["oid"] == "main_oid_pag_repo2"
-    assert branch_map_full["user_repo_p2"][0]["target"]["messageHeadline"] == "Commit for pag-repo2"
-    assert branch_map_full["user_repo_p2"][0]["target"]["message"] == "Test commit message."
-    assert "user_repo_p2" in tag_map_full and tag_map_full["user_repo_p2"][0]["name"] == "v_p2"
-    assert tag_map_full["user_repo_p2"][0]["target"]["oid"] == "tag_oid_pag_repo2"
-    assert tag_map_full["user_repo_p2"][0]["target"]["messageHeadline"] == "Tag for pag-repo2"
-    assert tag_map_full["user_repo_p2"][0]["target"]["message"] == "Test commit message."
-
-@patch('query_github._github_graphql')
-def test_fetch_repos_full_graphql_user_paginated_branches(mock_target_function):
-    # user_repo_fetch_single_many_b: inline tags hasNextPage=False, paginated branches hasNextPage=True, endCursor="user_branch_cursor_inline_end"
-    user_repo_fetch_single_many_b = {"user": {"repositories": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "repo_with_many_branches_user", "description": "User Repo with paginated branches", "url": "", "stargazerCount": 0, "forkCount": 0, "isFork": False, "isPrivate": False, "primaryLanguage": None, "createdAt": "2023-01-01T00:00:00Z", "updatedAt": "2023-01-01T00:00:00Z", "pushedAt": "2023-01-01T00:00:00Z", "refs": {"pageInfo": {"hasNextPage": True, "endCursor": "user_branch_cursor_inline_end"}, "nodes": [{"name": "main_for_user_branches", "target": {"oid": "main_oid_user_branches", "messageHeadline": "Initial commit", "message": "Test commit message."}}]}, "tags": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "user_tag_for_branches_repo", "target": {"oid": "tag_oid_user_branches", "messageHeadline": "Tag for branches repo", "message": "Test commit message."}}]}}]}}}
-    user_branch_fetch_page1 = {"repository": {"refs": {"pageInfo": {"hasNextPage": True, "endCursor": "user_branch_cursor_page1_end"}, "nodes": [{"name": "user_branch_X", "target": {"oid": "b1_oid_user_pb", "messageHeadline": "Branch 1 commit", "message": "Test commit message."}}]}}} # Fetched with after="user_branch_cursor_inline_end"
-    user_branch_fetch_page2 = {"repository": {"refs": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "user_branch_Y", "target": {"oid": "b2_oid_user_pb", "messageHeadline": "Branch 2 commit", "message": "Test commit message."}}]}}} # Fetched with after="user_branch_cursor_page1_end"
-    # No separate tag call needed for repo_with_many_branches_user as inline tags.hasNextPage=False
-    api_calls_user_pag_branches = []
-    call_count_user_pag_branches = 0
-    
-    def mock_gql_dispatch_user_pag_branches(query, variables, headers):
-        nonlocal call_count_user_pag_branches
-        api_calls_user_pag_branches.append(variables.copy()); call_count_user_pag_branches += 1; query_github.API_CALL_COUNT += 1
-        login_var = variables.get("login"); repo_name_var = variables.get("repoName"); ref_prefix_var = variables.get("refPrefix"); after_cursor_var = variables.get("after")
-        if login_var == "user_many_branches_test" and not repo_name_var: return user_repo_fetch_single_many_b
-        elif repo_name_var == "repo_with_many_branches_user":
-            if ref_prefix_var == "refs/heads/":
-                if after_cursor_var == "user_branch_cursor_inline_end": return user_branch_fetch_page1
-                elif after_cursor_var == "user_branch_cursor_page1_end": return user_branch_fetch_page2
-            # No tag call expected
-        raise ValueError(f"Unexpected GQL call for user_paginated_branches test: {variables}")
-    
-    mock_target_function.side_effect = mock_gql_dispatch_user_pag_branches
-    
-    query_github.API_CALL_COUNT = 0
-    repo_map, branch_map_full, tag_map_full = query_github.fetch_repos_full_graphql(username="user_many_branches_test", token="token_user_many_branches", include_tags=True, is_org=False)
-    # Expected calls: initial_repo, branch_call_p1, branch_call_p2 = 3 calls
-    assert query_github.API_CALL_COUNT == 3; assert call_count_user_pag_branches == 3
-    assert len(api_calls_user_pag_branches) == 3
-    # Call 0: initial_repo
-    assert api_calls_user_pag_branches[0].get("login") == "user_many_branches_test"
-    # Call 1: First paginated branch call
-    assert api_calls_user_pag_branches[1].get("repoName") == "repo_with_many_branches_user"
-    assert api_calls_user_pag_branches[1].get("refPrefix") == "refs/heads/"
-    assert api_calls_user_pag_branches[1].get("after") == "user_branch_cursor_inline_end"
-    # Call 2: Second paginated branch call
-    assert api_calls_user_pag_branches[2].get("repoName") == "repo_with_many_branches_user"
-    assert api_calls_user_pag_branches[2].get("refPrefix") == "refs/heads/"
-    assert api_calls_user_pag_branches[2].get("after") == "user_branch_cursor_page1_end"
-
-    assert len(repo_map) == 1
-    assert "repo_with_many_branches_user" in repo_map
-    assert "repo_with_many_branches_user" in branch_map_full and len(branch_map_full["repo_with_many_branches_user"]) == 3 # initial + p1 + p2
-    for b in branch_map_full["repo_with_many_branches_user"]:
-        assert 'message' in b['target']
-        assert b['target']['message'] == 'Test commit message.'
-    assert "repo_with_many_branches_user" in tag_map_full and len(tag_map_full["repo_with_many_branches_user"]) == 1
-    assert tag_map_full["repo_with_many_branches_user"][0]["name"] == "user_tag_for_branches_repo"
-    assert tag_map_full["repo_with_many_branches_user"][0]["target"]["oid"] == "tag_oid_user_branches"
-    assert tag_map_full["repo_with_many_branches_user"][0]["target"]["messageHeadline"] == "Tag for branches repo"
-    assert tag_map_full["repo_with_many_branches_user"][0]["target"]["message"] == "Test commit message."
-
-@patch('query_github._github_graphql')
-def test_fetch_repos_full_graphql_user_paginated_tags(mock_target_function):
-    # Mock data definitions
-    # user_repo_fetch_single_many_t: inline branches hasNextPage=False, inline tags hasNextPage=True, endCursor="user_tag_cursor_inline_end"
-    user_repo_fetch_single_many_t = {"user": {"repositories": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "repo_with_many_tags_user", "description": "User Repo with paginated tags", "url": "", "stargazerCount": 0, "forkCount": 0, "isFork": False, "isPrivate": False, "primaryLanguage": None, "createdAt": "2023-01-01T00:00:00Z", "updatedAt": "2023-01-01T00:00:00Z", "pushedAt": "2023-01-01T00:00:00Z", "refs": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "main_for_user_tags", "target": {"oid": "main_oid_user_tags", "messageHeadline": "Initial commit", "message": "Test commit message."}}]}, "tags": {"pageInfo": {"hasNextPage": True, "endCursor": "user_tag_cursor_inline_end"}, "nodes": [{"name": "user_tag_initial", "target": {"oid": "tag_oid_user_tags", "messageHeadline": "Tag for tags repo", "message": "Test commit message."}}]}}]}}}
-    # No separate branch call needed for repo_with_many_tags_user
-    user_tag_fetch_page1 = {"repository": {"tags": {"pageInfo": {"hasNextPage": True, "endCursor": "user_tag_cursor_page1_end"}, "nodes": [{"name": "user_tag_X", "target": {"oid": "t1_oid_user_tags", "messageHeadline": "Tag X commit", "message": "Test commit message."}}]}}} # Fetched with after="user_tag_cursor_inline_end"
-    user_tag_fetch_page2 = {"repository": {"tags": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "user_tag_Y", "target": {"oid": "t2_oid_user_tags", "messageHeadline": "Tag Y commit", "message": "Test commit message."}}]}}} # Fetched with after="user_tag_cursor_page1_end"
-    api_calls_user_pag_tags = []
-    call_count_user_pag_tags = 0
-    
-    def mock_gql_dispatch_user_pag_tags(query, variables, headers):
-        nonlocal call_count_user_pag_tags
-        api_calls_user_pag_tags.append(variables.copy()); call_count_user_pag_tags += 1; query_github.API_CALL_COUNT += 1
-        login_var = variables.get("login"); repo_name_var = variables.get("repoName"); ref_prefix_var = variables.get("refPrefix"); after_cursor_var = variables.get("after")
-        if login_var == "user_many_tags_test" and not repo_name_var: return user_repo_fetch_single_many_t
-        elif repo_name_var == "repo_with_many_tags_user":
-            # No branch call expected as inline refs.hasNextPage=False
-            if ref_prefix_var is None:
-                if after_cursor_var == "user_tag_cursor_inline_end": return user_tag_fetch_page1
-                elif after_cursor_var == "user_tag_cursor_page1_end": return user_tag_fetch_page2
-        raise ValueError(f"Unexpected GQL call for user_paginated_tags test: {variables}")
-    
-    mock_target_function.side_effect = mock_gql_dispatch_user_pag_tags
-    
-    query_github.API_CALL_COUNT = 0
-    repo_map, branch_map_full, tag_map_full = query_github.fetch_repos_full_graphql(username="user_many_tags_test", token="token_user_many_tags", include_tags=True, is_org=False)
-    # Expected calls: initial_repo, tag_call_p1, tag_call_p2 = 3 calls
-    assert query_github.API_CALL_COUNT == 3; assert call_count_user_pag_tags == 3
-    assert len(api_calls_user_pag_tags) == 3
-    # Call 0: initial_repo
-    assert api_calls_user_pag_tags[0].get("login") == "user_many_tags_test"
-    # Call 1: First paginated tag call
-    assert api_calls_user_pag_tags[1].get("repoName") == "repo_with_many_tags_user"
-    assert api_calls_user_pag_tags[1].get("refPrefix") is None
-    assert api_calls_user_pag_tags[1].get("after") == "user_tag_cursor_inline_end"
-    # Call 2: Second paginated tag call
-    assert api_calls_user_pag_tags[2].get("repoName") == "repo_with_many_tags_user"
-    assert api_calls_user_pag_tags[2].get("refPrefix") is None
-    assert api_calls_user_pag_tags[2].get("after") == "user_tag_cursor_page1_end"
-
-    assert len(repo_map) == 1
-    assert "repo_with_many_tags_user" in repo_map
-    assert "repo_with_many_tags_user" in branch_map_full and len(branch_map_full["repo_with_many_tags_user"]) == 1 and branch_map_full["repo_with_many_tags_user"][0]["name"] == "main_for_user_tags"
-    assert branch_map_full["repo_with_many_tags_user"][0]["target"]["oid"] == "main_oid_user_tags"
-    assert branch_map_full["repo_with_many_tags_user"][0]["target"]["messageHeadline"] == "Initial commit"
-    assert branch_map_full["repo_with_many_tags_user"][0]["target"]["message"] == "Test commit message."
-    assert "repo_with_many_tags_user" in tag_map_full and len(tag_map_full["repo_with_many_tags_user"]) == 3 # initial + p1 + p2
-    for t in tag_map_full["repo_with_many_tags_user"]:
-        assert 'message' in t['target']
-        assert t['target']['message'] == 'Test commit message.'
-
-@patch('query_github._github_graphql')
-def test_fetch_repos_full_graphql_user_paginated_branches_and_tags(mock_target_function):
-    # user_repo_fetch_single_pag_b_t: paginated branches (inline + 2 pages), paginated tags (inline + 2 pages)
-    user_repo_fetch_single_pag_b_t = {"user": {"repositories": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "repo_user_pag_b_t", "description": "User Repo paginated B & T", "url": "", "stargazerCount": 0, "forkCount": 0, "isFork": False, "isPrivate": False, "primaryLanguage": None, "createdAt": "2023-01-01T00:00:00Z", "updatedAt": "2023-01-01T00:00:00Z", "pushedAt": "2023-01-01T00:00:00Z", 
-            "refs": {"pageInfo": {"hasNextPage": True, "endCursor": "user_b_t_branch_cursor_inline_end"}, "nodes": [{"name": "user_b_t_branch_main", "target": {"oid": "main_oid_user_b_t", "messageHeadline": "Initial commit", "message": "Test commit message."}}]}, 
-            "tags": {"pageInfo": {"hasNextPage": True, "endCursor": "user_b_t_tag_cursor_inline_end"}, "nodes": [{"name": "user_b_t_tag_v1", "target": {"oid": "tag_oid_user_b_t", "messageHeadline": "Tag v1 commit", "message": "Test commit message."}}]}}]}}}
-        
-    user_b_t_branch_fetch_p1 = {"repository": {"refs": {"pageInfo": {"hasNextPage": True, "endCursor": "user_b_t_branch_cursor_page1_end"}, "nodes": [{"name": "user_b_t_branch_dev", "target": {"oid": "b1_oid_user_b_t", "messageHeadline": "Branch dev commit", "message": "Test commit message."}}]}}} # after="user_b_t_branch_cursor_inline_end"
-    user_b_t_branch_fetch_p2 = {"repository": {"refs": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "user_b_t_branch_feat", "target": {"oid": "b2_oid_user_b_t", "messageHeadline": "Branch feat commit", "message": "Test commit message."}}]}}} # after="user_b_t_branch_cursor_page1_end"
-        
-    user_b_t_tag_fetch_p1 = {"repository": {"tags": {"pageInfo": {"hasNextPage": True, "endCursor": "user_b_t_tag_cursor_page1_end"}, "nodes": [{"name": "user_b_t_tag_v2", "target": {"oid": "t1_oid_user_b_t", "messageHeadline": "Tag v2 commit", "message": "Test commit message."}}]}}} # after="user_b_t_tag_cursor_inline_end"
-    user_b_t_tag_fetch_p2 = {"repository": {"tags": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "user_b_t_tag_v3", "target": {"oid": "t2_oid_user_b_t", "messageHeadline": "Tag v3 commit", "message": "Test commit message."}}]}}} # after="user_b_t_tag_cursor_page1_end"
-        
-    api_calls_user_pag_b_t = []
-    call_count_user_pag_b_t = 0
-
-    def mock_gql_dispatch_user_pag_b_t(query, variables, headers):
-        nonlocal call_count_user_pag_b_t
-        api_calls_user_pag_b_t.append(variables.copy()); call_count_user_pag_b_t += 1; query_github.API_CALL_COUNT += 1
-        login_var = variables.get("login"); repo_name_var = variables.get("repoName"); ref_prefix_var = variables.get("refPrefix"); after_cursor_var = variables.get("after")
-
-        if login_var == "user_pag_b_t_test" and not repo_name_var: return user_repo_fetch_single_pag_b_t
-        elif repo_name_var == "repo_user_pag_b_t":
-            if ref_prefix_var == "refs/heads/": # Branch calls
-                if after_cursor_var == "user_b_t_branch_cursor_inline_end": return user_b_t_branch_fetch_p1
-                elif after_cursor_var == "user_b_t_branch_cursor_page1_end": return user_b_t_branch_fetch_p2
-            elif ref_prefix_var is None: # Tag calls
-                if after_cursor_var == "user_b_t_tag_cursor_inline_end": return user_b_t_tag_fetch_p1
-                elif after_cursor_var == "user_b_t_tag_cursor_page1_end": return user_b_t_tag_fetch_p2
-        raise ValueError(f"Unexpected GQL call for user_paginated_branches_and_tags test: {variables}")
-
-    mock_target_function.side_effect = mock_gql_dispatch_user_pag_b_t
-
-    query_github.API_CALL_COUNT = 0
-    repo_map, branch_map_full, tag_map_full = query_github.fetch_repos_full_graphql(username="user_pag_b_t_test", token="token_user_pag_b_t", include_tags=True, is_org=False)
-    # Expected calls: initial_repo, branch_p1, branch_p2, tag_p1, tag_p2 = 5 calls
-    assert query_github.API_CALL_COUNT == 5; assert call_count_user_pag_b_t == 5
-    assert len(api_calls_user_pag_b_t) == 5
-    # Call 0: initial_repo
-    assert api_calls_user_pag_b_t[0].get("login") == "user_pag_b_t_test"
-    # Call 1: Branch page 1
-    assert api_calls_user_pag_b_t[1].get("repoName") == "repo_user_pag_b_t"
-    assert api_calls_user_pag_b_t[1].get("refPrefix") == "refs/heads/"
-    assert api_calls_user_pag_b_t[1].get("after") == "user_b_t_branch_cursor_inline_end"
-    # Call 2: Branch page 2
-    assert api_calls_user_pag_b_t[2].get("repoName") == "repo_user_pag_b_t"
-    assert api_calls_user_pag_b_t[2].get("refPrefix") == "refs/heads/"
-    assert api_calls_user_pag_b_t[2].get("after") == "user_b_t_branch_cursor_page1_end"
-    # Call 3: Tag page 1
-    assert api_calls_user_pag_b_t[3].get("repoName") == "repo_user_pag_b_t"
-    assert api_calls_user_pag_b_t[3].get("refPrefix") is None
-    assert api_calls_user_pag_b_t[3].get("after") == "user_b_t_tag_cursor_inline_end"
-    # Call 4: Tag page 2
-    assert api_calls_user_pag_b_t[4].get("repoName") == "repo_user_pag_b_t"
-    assert api_calls_user_pag_b_t[4].get("refPrefix") is None
-    assert api_calls_user_pag_b_t[4].get("after") == "user_b_t_tag_cursor_page1_end"
-
-    assert len(repo_map) == 1
-    assert "repo_user_pag_b_t" in repo_map
-    assert "repo_user_pag_b_t" in branch_map_full and len(branch_map_full["repo_user_pag_b_t"]) == 3
-    for b in branch_map_full["repo_user_pag_b_t"]:
-        assert 'message' in b['target']
-        assert b['target']['message'] == 'Test commit message.'
-    assert "repo_user_pag_b_t" in tag_map_full and len(tag_map_full["repo_user_pag_b_t"]) == 3
-    for t in tag_map_full["repo_user_pag_b_t"]:
-        assert 'message' in t['target']
-        assert t['target']['message'] == 'Test commit message.'
-
-# === Organization Test Cases ===
\ No newline at end of file
+
+    assert stub.calls == list(case.responses)
+
+    assert set(repo_map) == set(case.expected_repos)
+    for repo, fields in case.expected_repos.items():
+        for key, value in fields.items():
+            assert repo_map[repo][key] == value
+
+    assert_refs(branch_map_full, case.expected_branches)
+    assert_refs(tag_map_full, case.expected_tags)